@@ -10,20 +10,33 @@ See: https://github.com/microsoft/playwright/issues/36139
 """
 
 import argparse
+import os
 import sys
 import time
-import re
+import functools
+import traceback
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
 
-from patchright.sync_api import sync_playwright
+from patchright.sync_api import Page, Error as PlaywrightError
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from auth_manager import AuthManager
+from auth_manager import get_auth_manager
 from notebook_manager import NotebookLibrary
-from config import QUERY_INPUT_SELECTORS, RESPONSE_SELECTORS
-from browser_utils import BrowserFactory, StealthUtils
+from config import (
+    QUERY_INPUT_SELECTORS, QUERY_INPUT_SELECTOR, RESPONSE_SELECTORS, THINKING_SELECTOR,
+    GOOGLE_LOGIN_URL_PATTERN,
+    QUERY_TIMEOUT_SECONDS, PAGE_LOAD_TIMEOUT, ANSWER_QUIET_MS,
+    SET_VALUE_MIN_CHARS, MAX_QUESTIONS_FILE_BYTES, DEBUG, DEBUG_DIR
+)
+from browser_daemon import ask_via_daemon
+from browser_utils import (
+    StealthUtils, first_visible, last_text, wait_for_stable_text, get_session, close_session
+)
 
 
 # Follow-up reminder (adapted from MCP server for stateless operation)
@@ -37,171 +50,508 @@ FOLLOW_UP_REMINDER = (
 )
 
 
-def ask_notebooklm(question: str, notebook_url: str, headless: bool = True) -> str:
-    """
-    Ask a question to NotebookLM
+@functools.lru_cache(maxsize=1)
+def get_library() -> NotebookLibrary:
+    """NotebookLibrary loaded once per process"""
+    return NotebookLibrary()
 
-    Args:
-        question: Question to ask
-        notebook_url: NotebookLM notebook URL
-        headless: Run browser in headless mode
+
+def open_notebook(page: Page, notebook_url: str) -> bool:
+    """
+    Navigate to a notebook and wait until its query input is ready
 
     Returns:
-        Answer text from NotebookLM
+        True if the query input was found
     """
-    auth = AuthManager()
+    print("  🌐 Opening notebook...")
+    # Return on commit; the login check and input wait below gate readiness
+    page.goto(notebook_url, wait_until="commit", timeout=PAGE_LOAD_TIMEOUT)
+
+    # Fail fast instead of waiting out the URL timeout on the login page
+    if GOOGLE_LOGIN_URL_PATTERN.match(page.url):
+        print("  ❌ Redirected to Google login. Run: python auth_manager.py setup")
+        return False
+
+    # Wait for query input (MCP approach)
+    print("  ⏳ Waiting for query input...")
+
+    # Only check visibility, not disabled!
+    # goto returned on commit, so this wait covers the whole app load
+    if first_visible(page, QUERY_INPUT_SELECTORS, timeout=PAGE_LOAD_TIMEOUT):
+        print("  ✓ Found query input")
+        return True
+
+    print("  ❌ Could not find query input")
+    return False
+
+
+def _latest_response(page: Page) -> Optional[str]:
+    """Get the text of the newest response on the page, if any"""
+    return last_text(page, RESPONSE_SELECTORS)
+
+
+class _AnswerWatch:
+    """Tracks one submitted question until its answer is stable"""
+
+    def __init__(self, previous_answer: Optional[str]):
+        self.previous_answer = previous_answer
+        self.last_text = None
+        self.stable_count = 0
+
+    def check(self, page: Page) -> Optional[str]:
+        """Poll once; return the answer after it is stable for 3 polls"""
+        # Check if NotebookLM is still thinking (most reliable indicator)
+        try:
+            if page.locator(THINKING_SELECTOR).first.is_visible():  # False when absent
+                return None
+        except PlaywrightError:
+            return None
+
+        text = _latest_response(page)
+        if text and text != self.previous_answer:
+            if text == self.last_text:
+                self.stable_count += 1
+                if self.stable_count >= 3:  # Stable for 3 polls
+                    return text
+            else:
+                self.stable_count = 0
+                self.last_text = text
 
-    if not auth.is_authenticated():
-        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
         return None
 
-    print(f"💬 Asking: {question}")
-    print(f"📚 Notebook: {notebook_url}")
+    def wait(self, page: Page, timeout_ms: int) -> Optional[str]:
+        """
+        Block until the answer is stable, with one debounced wait in the
+        browser (for when only this question is being watched)
+
+        Returns:
+            Answer text, or None on timeout
+        """
+        return wait_for_stable_text(
+            page,
+            RESPONSE_SELECTORS,
+            self.previous_answer,
+            timeout=timeout_ms,
+            busy_selector=THINKING_SELECTOR,
+            quiet_ms=ANSWER_QUIET_MS
+        )
+
+
+def _submit_question(page: Page, question: str) -> _AnswerWatch:
+    """Enter and submit a question on an already opened notebook page"""
+    # Snapshot the current answer so an earlier one isn't mistaken for ours
+    previous_answer = _latest_response(page)
+
+    # Enter question in one step; per-character typing only added latency
+    print("  ⏳ Typing question...")
+
+    # Fill whichever input selector matches. Very long questions are set
+    # as the value directly, skipping fill()'s per-input work
+    query_input = page.locator(QUERY_INPUT_SELECTOR).first
+    if len(question) >= SET_VALUE_MIN_CHARS:
+        StealthUtils.set_value(query_input, question)
+    else:
+        query_input.fill(question)
+
+    # Submit on the input itself, not whatever element has focus
+    print("  📤 Submitting...")
+    query_input.press("Enter")
+
+    # No settle delay: the answer wait ignores the previous answer
+    return _AnswerWatch(previous_answer)
+
 
-    playwright = None
-    context = None
+def ask_on_page(page: Page, question: str) -> Optional[str]:
+    """
+    Ask a question on an already opened notebook page
+
+    Returns:
+        Answer text, or None on timeout
+    """
+    watch = _submit_question(page, question)
+
+    # Wait for response (stable text, debounced in the browser)
+    print("  ⏳ Waiting for answer...")
+
+    answer = watch.wait(page, QUERY_TIMEOUT_SECONDS * 1000)
+    if answer:
+        print("  ✅ Got answer!")
+        return answer
+
+    print("  ❌ Timeout waiting for answer")
+    return None
 
+
+def _save_debug_screenshot(page: Page, name: str):
+    """Save a viewport screenshot (compact JPEG) for debugging a failure"""
     try:
-        # Start playwright
-        playwright = sync_playwright().start()
+        DEBUG_DIR.mkdir(parents=True, exist_ok=True)
+        debug_path = DEBUG_DIR / f"{name}_{time.strftime('%Y%m%d_%H%M%S')}.jpg"
+        page.screenshot(path=str(debug_path), full_page=False, type="jpeg", quality=60)
+        print(f"  📸 Saved debug screenshot: {debug_path}")
+    except Exception as e:
+        print(f"  ⚠️ Could not save debug screenshot: {e}")
 
-        # Launch persistent browser context using factory
-        context = BrowserFactory.launch_persistent_context(
-            playwright,
-            headless=headless
-        )
 
-        # Navigate to notebook
-        page = context.new_page()
-        print("  🌐 Opening notebook...")
-        page.goto(notebook_url, wait_until="domcontentloaded")
+def _run_on_notebook(
+    task: Callable[[Page], Any],
+    notebook_url: str,
+    failure: Any,
+    headless: bool,
+    reuse_session: bool,
+    debug: bool
+) -> Any:
+    """
+    Run a task on a tab opened on the notebook
 
-        # Wait for NotebookLM
-        page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=10000)
+    Handles the auth check, the shared session, error reporting and
+    cleanup, so the task itself only deals with the ready page.
 
-        # Wait for query input (MCP approach)
-        print("  ⏳ Waiting for query input...")
-        query_element = None
+    Args:
+        task: Called with the ready page; returns the result
+        notebook_url: NotebookLM notebook URL
+        failure: Returned when the notebook can't be opened or on error
+        headless: Run browser in headless mode
+        reuse_session: Keep the browser open
+        debug: Print full tracebacks and save failure screenshots
 
-        for selector in QUERY_INPUT_SELECTORS:
-            try:
-                query_element = page.wait_for_selector(
-                    selector,
-                    timeout=10000,
-                    state="visible"  # Only check visibility, not disabled!
-                )
-                if query_element:
-                    print(f"  ✓ Found input: {selector}")
-                    break
-            except:
-                continue
-
-        if not query_element:
-            print("  ❌ Could not find query input")
-            return None
+    Returns:
+        The task's result, or failure
+    """
+    if not get_auth_manager().is_authenticated():
+        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+        return failure
 
-        # Type question (human-like, fast)
-        print("  ⏳ Typing question...")
-        
-        # Use primary selector for typing
-        input_selector = QUERY_INPUT_SELECTORS[0]
-        StealthUtils.human_type(page, input_selector, question)
+    print(f"📚 Notebook: {notebook_url}")
 
-        # Submit
-        print("  📤 Submitting...")
-        page.keyboard.press("Enter")
+    page = None
 
-        # Small pause
-        StealthUtils.random_delay(500, 1500)
+    try:
+        # Launch (or reuse) the persistent browser context; each call gets
+        # its own tab, so it starts a fresh chat
+        session = get_session(headless)
+        page = session.context.new_page()
 
-        # Wait for response (MCP approach: poll for stable text)
-        print("  ⏳ Waiting for answer...")
+        if not open_notebook(page, notebook_url):
+            if debug:
+                _save_debug_screenshot(page, "query_input_missing")
+            return failure
 
-        answer = None
-        stable_count = 0
-        last_text = None
-        deadline = time.time() + 120  # 2 minutes timeout
+        return task(page)
 
-        while time.time() < deadline:
-            # Check if NotebookLM is still thinking (most reliable indicator)
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        if debug:
+            traceback.print_exc()
+        return failure
+
+    finally:
+        # Close the tab; close the browser itself only if not reused
+        if page:
             try:
-                thinking_element = page.query_selector('div.thinking-message')
-                if thinking_element and thinking_element.is_visible():
-                    time.sleep(1)
-                    continue
-            except:
+                page.close()
+            except PlaywrightError:
                 pass
 
-            # Try to find response with MCP selectors
-            for selector in RESPONSE_SELECTORS:
-                try:
-                    elements = page.query_selector_all(selector)
-                    if elements:
-                        # Get last (newest) response
-                        latest = elements[-1]
-                        text = latest.inner_text().strip()
-
-                        if text:
-                            if text == last_text:
-                                stable_count += 1
-                                if stable_count >= 3:  # Stable for 3 polls
-                                    answer = text
-                                    break
-                            else:
-                                stable_count = 0
-                                last_text = text
-                except:
-                    continue
-
-            if answer:
-                break
-
-            time.sleep(1)
+        if not reuse_session:
+            close_session()
+
+
+def ask_notebooklm(
+    question: str,
+    notebook_url: str,
+    headless: bool = True,
+    reuse_session: bool = False,
+    debug: bool = DEBUG
+) -> str:
+    """
+    Ask a question to NotebookLM
+
+    Args:
+        question: Question to ask
+        notebook_url: NotebookLM notebook URL
+        headless: Run browser in headless mode
+        reuse_session: Keep the browser running for later calls in this
+            process (it is shut down automatically at exit)
+        debug: Print full tracebacks on errors
 
+    Returns:
+        Answer text from NotebookLM
+    """
+    print(f"💬 Asking: {question}")
+
+    def task(page: Page):
+        answer = ask_on_page(page, question)
         if not answer:
-            print("  ❌ Timeout waiting for answer")
+            if debug:
+                _save_debug_screenshot(page, "answer_timeout")
             return None
 
-        print("  ✅ Got answer!")
         # Add follow-up reminder to encourage Claude to ask more questions
         return answer + FOLLOW_UP_REMINDER
 
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+    return _run_on_notebook(task, notebook_url, None, headless, reuse_session, debug)
 
-    finally:
-        # Always clean up
-        if context:
-            try:
-                context.close()
-            except:
-                pass
 
-        if playwright:
+def ask_questions(
+    questions: List[str],
+    notebook_url: str,
+    headless: bool = True,
+    reuse_session: bool = False,
+    debug: bool = DEBUG
+) -> List[Optional[str]]:
+    """
+    Ask several questions in a single browser session
+
+    The notebook is opened once and the questions are asked one after
+    another in the same chat, so later questions can build on earlier answers.
+
+    Args:
+        questions: Questions to ask, in order
+        notebook_url: NotebookLM notebook URL
+        headless: Run browser in headless mode
+        reuse_session: Keep the browser open for later calls in this process
+        debug: Print full tracebacks on errors
+
+    Returns:
+        One answer per question (None where the question failed)
+    """
+    answers: List[Optional[str]] = [None] * len(questions)
+    print(f"💬 Asking {len(questions)} questions")
+
+    def task(page: Page):
+        for i, question in enumerate(questions):
+            print(f"💬 [{i + 1}/{len(questions)}] Asking: {question}")
+            answers[i] = ask_on_page(page, question)
+            if not answers[i] and debug:
+                _save_debug_screenshot(page, f"answer_timeout_{i + 1}")
+        return answers
+
+    return _run_on_notebook(task, notebook_url, answers, headless, reuse_session, debug)
+
+
+def ask_questions_parallel(
+    questions: List[str],
+    notebook_url: str,
+    max_parallel: int = 3,
+    headless: bool = True,
+    reuse_session: bool = False,
+    debug: bool = DEBUG
+) -> List[Optional[str]]:
+    """
+    Ask questions concurrently on several tabs of one browser session
+
+    Up to max_parallel questions are submitted on separate tabs and their
+    answers are polled together, so NotebookLM generates them at the same
+    time. Questions wait in a queue and go to whichever tab frees up
+    first. Each tab keeps its own chat, so use this for independent
+    questions; ask_questions() is the sequential, single-chat variant.
+
+    Args:
+        questions: Questions to ask
+        notebook_url: NotebookLM notebook URL
+        max_parallel: Maximum number of tabs waiting for answers at once
+        headless: Run browser in headless mode
+        reuse_session: Keep the browser open for later calls in this process
+        debug: Print full tracebacks on errors
+
+    Returns:
+        One answer per question, in input order (None where it failed)
+    """
+    if max_parallel <= 1:
+        return ask_questions(questions, notebook_url, headless, reuse_session, debug)
+
+    total = len(questions)
+    answers: List[Optional[str]] = [None] * total
+    print(f"💬 Asking {total} questions ({max_parallel} at a time)")
+
+    def task(page: Page):
+        pages = [page]
+        idle_tabs = [page]
+        queued = deque(range(total))
+        pending = {}  # question index -> (tab, watch, deadline)
+        can_open_tabs = True
+
+        try:
+            while queued or pending:
+                # Hand queued questions to free tabs as soon as they free up,
+                # opening extra tabs lazily up to max_parallel (timed-out tabs
+                # stay busy with their late answer, so every open tab counts)
+                while queued and (idle_tabs or (can_open_tabs and len(pages) < max_parallel)):
+                    if not idle_tabs:
+                        try:
+                            extra_page = page.context.new_page()
+                            pages.append(extra_page)
+                            opened = open_notebook(extra_page, notebook_url)
+                            if not opened and debug:
+                                _save_debug_screenshot(extra_page, "query_input_missing")
+                        except PlaywrightError as e:
+                            print(f"  ⚠️ Could not open another tab: {e}")
+                            opened = False
+                        if not opened:
+                            can_open_tabs = False  # Carry on with the tabs already open
+                            continue
+                        idle_tabs.append(extra_page)
+
+                    tab = idle_tabs.pop()
+                    i = queued.popleft()
+                    print(f"💬 [{i + 1}/{total}] Asking: {questions[i]}")
+                    try:
+                        watch = _submit_question(tab, questions[i])
+                    except PlaywrightError as e:
+                        # Leave the tab out of rotation; the other tabs carry on
+                        print(f"  ❌ [{i + 1}/{total}] Could not submit: {e}")
+                        continue
+                    pending[i] = (tab, watch, time.time() + QUERY_TIMEOUT_SECONDS)
+
+                if not pending:
+                    break  # No usable tab left for the remaining questions
+
+                # Sleep inside Playwright so its event loop keeps running
+                page.wait_for_timeout(1000)
+
+                for i, (tab, watch, deadline) in list(pending.items()):
+                    answer = watch.check(tab)
+                    if answer:
+                        print(f"  ✅ [{i + 1}/{total}] Got answer!")
+                        answers[i] = answer
+                        idle_tabs.append(tab)
+                    elif time.time() >= deadline:
+                        # Still busy with the late answer, so the tab isn't reused
+                        print(f"  ❌ [{i + 1}/{total}] Timeout waiting for answer")
+                        if debug:
+                            _save_debug_screenshot(tab, f"answer_timeout_{i + 1}")
+                    else:
+                        continue
+                    del pending[i]
+
+            return answers
+
+        finally:
+            # The first tab is managed by _run_on_notebook
+            for extra_page in pages[1:]:
+                try:
+                    extra_page.close()
+                except PlaywrightError:
+                    pass
+
+    return _run_on_notebook(task, notebook_url, answers, headless, reuse_session, debug)
+
+
+def _read_questions(questions_path: Path) -> List[str]:
+    """Read non-empty lines from a questions file"""
+    lines = questions_path.read_text(encoding='utf-8').splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def _read_questions_during_launch(questions_path: Path, headless: bool) -> List[str]:
+    """
+    Read a questions file while the browser starts up
+
+    Playwright's sync API is bound to the calling thread, so the browser is
+    launched here and the file is read in a worker thread instead.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(_read_questions, questions_path)
+
+        if get_auth_manager().is_authenticated():
             try:
-                playwright.stop()
-            except:
-                pass
+                get_session(headless)
+            except Exception:
+                pass  # Reported again by the ask call that follows
+
+        return future.result()
+
+
+def _ask_batch(
+    questions: List[str],
+    notebook_url: str,
+    headless: bool,
+    parallel: int,
+    reuse_session: bool,
+    debug: bool
+) -> int:
+    """Ask several questions in one session and print every answer"""
+    if parallel > 1:
+        answers = ask_questions_parallel(
+            questions, notebook_url, max_parallel=parallel, headless=headless,
+            reuse_session=reuse_session, debug=debug
+        )
+    else:
+        answers = ask_questions(
+            questions, notebook_url, headless=headless,
+            reuse_session=reuse_session, debug=debug
+        )
+
+    return print_answers(questions, answers)
+
+
+def print_answers(questions: List[str], answers: List[Optional[str]]) -> int:
+    """Print every answer of a batch; returns the exit code"""
+    failed = 0
+    for question, answer in zip(questions, answers):
+        if answer:
+            print_answer(question, answer)
+        else:
+            print(f"\n❌ Failed to get answer for: {question}")
+            failed += 1
+
+    if failed < len(questions):
+        print(FOLLOW_UP_REMINDER.strip())
+
+    return 1 if failed else 0
+
+
+def print_answer(question: str, answer: str):
+    """Print a question/answer block"""
+    print("\n" + "=" * 60)
+    print(f"Question: {question}")
+    print("=" * 60)
+    print()
+    print(answer)
+    print()
+    print("=" * 60)
+
+
+def _fast_exit(code: int):
+    """
+    Exit without waiting for the browser to shut down
+
+    The sync Playwright API can't close the context from a background
+    thread, so the process exits right away instead; the driver notices its
+    pipe closing and shuts the browser down on its own.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Ask NotebookLM a question')
 
-    parser.add_argument('--question', required=True, help='Question to ask')
+    parser.add_argument('--question', action='append', help='Question to ask (repeat to ask several)')
+    parser.add_argument('--questions-file', help='File with one question per line')
     parser.add_argument('--notebook-url', help='NotebookLM notebook URL')
     parser.add_argument('--notebook-id', help='Notebook ID from library')
     parser.add_argument('--show-browser', action='store_true', help='Show browser')
+    parser.add_argument('--parallel', type=int, default=1,
+                        help='Ask up to N questions at once on separate tabs (default: 1)')
+    parser.add_argument('--fast-exit', action='store_true',
+                        help='Exit once answers are printed; the browser closes in the background')
+    parser.add_argument('--keep-alive', action='store_true',
+                        help='Ask through the background browser daemon, keeping the browser open for later calls')
+    parser.add_argument('--debug', action='store_true', help='Print full tracebacks on errors')
 
     args = parser.parse_args()
 
+    if not args.question and not args.questions_file:
+        parser.error("provide --question or --questions-file")
+
     # Resolve notebook URL
     notebook_url = args.notebook_url
 
     if not notebook_url and args.notebook_id:
-        library = NotebookLibrary()
+        library = get_library()
         notebook = library.get_notebook(args.notebook_id)
         if notebook:
             notebook_url = notebook['url']
@@ -211,7 +561,7 @@ def main():
 
     if not notebook_url:
         # Check for active notebook first
-        library = NotebookLibrary()
+        library = get_library()
         active = library.get_active_notebook()
         if active:
             notebook_url = active['url']
@@ -231,25 +581,68 @@ def main():
                 print("python scripts/run.py notebook_manager.py add --url URL --name NAME --description DESC --topics TOPICS")
             return 1
 
-    # Ask the question
-    answer = ask_notebooklm(
-        question=args.question,
-        notebook_url=notebook_url,
-        headless=not args.show_browser
-    )
+    questions = list(args.question or [])
+    if args.questions_file:
+        questions_path = Path(args.questions_file)
+        if not questions_path.exists():
+            print(f"❌ Questions file not found: {questions_path}")
+            return 1
+        # Checked before the browser launch that overlaps the read
+        if questions_path.stat().st_size > MAX_QUESTIONS_FILE_BYTES:
+            print(f"❌ Questions file too large (over {MAX_QUESTIONS_FILE_BYTES // 1024} KB): {questions_path}")
+            return 1
+        try:
+            if args.keep_alive:
+                # The daemon's browser does the asking, so don't launch one here
+                questions.extend(_read_questions(questions_path))
+            else:
+                questions.extend(_read_questions_during_launch(questions_path, not args.show_browser))
+        except (UnicodeDecodeError, OSError) as e:
+            print(f"❌ Could not read questions file {questions_path}: {e}")
+            return 1
+        if not questions:
+            print(f"❌ No questions found in: {questions_path}")
+            return 1
 
-    if answer:
-        print("\n" + "=" * 60)
-        print(f"Question: {args.question}")
-        print("=" * 60)
-        print()
-        print(answer)
-        print()
-        print("=" * 60)
-        return 0
+    if args.keep_alive:
+        print("⏳ Asking through the browser daemon...")
+        answers = ask_via_daemon(
+            questions, notebook_url, headless=not args.show_browser, parallel=args.parallel
+        )
+        if answers is not None:
+            return print_answers(questions, answers)
+        print("  ⚠️ Browser daemon unavailable, asking in this process")
+
+    if len(questions) > 1:
+        code = _ask_batch(
+            questions,
+            notebook_url,
+            headless=not args.show_browser,
+            parallel=args.parallel,
+            reuse_session=args.fast_exit,
+            debug=args.debug or DEBUG
+        )
     else:
-        print("\n❌ Failed to get answer")
-        return 1
+        # Ask the question
+        answer = ask_notebooklm(
+            question=questions[0],
+            notebook_url=notebook_url,
+            headless=not args.show_browser,
+            reuse_session=args.fast_exit,
+            debug=args.debug or DEBUG
+        )
+
+        if answer:
+            print_answer(questions[0], answer)
+            code = 0
+        else:
+            print("\n❌ Failed to get answer")
+            code = 1
+
+    if args.fast_exit:
+        _fast_exit(code)
+
+    return code
 
 
 if __name__ == "__main__":
@@ -14,18 +14,20 @@ import json
 import time
 import argparse
 import shutil
-import re
 import sys
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-from patchright.sync_api import sync_playwright, BrowserContext
+from patchright.sync_api import BrowserContext
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import BROWSER_STATE_DIR, STATE_FILE, AUTH_INFO_FILE, DATA_DIR
-from browser_utils import BrowserFactory
+from config import (
+    BROWSER_STATE_DIR, STATE_FILE, AUTH_INFO_FILE, DATA_DIR, NOTEBOOKLM_URL_PATTERN,
+    AUTH_CHECK_TTL_SECONDS
+)
+from browser_utils import BrowserFactory, get_playwright, save_state
 
 
 class AuthManager:
@@ -49,8 +51,29 @@ class AuthManager:
         self.auth_info_file = AUTH_INFO_FILE
         self.browser_state_dir = BROWSER_STATE_DIR
 
+        # When is_authenticated() last succeeded
+        self._authenticated_at: Optional[float] = None
+
     def is_authenticated(self) -> bool:
-        """Check if valid authentication exists"""
+        """
+        Check if valid authentication exists
+
+        A success is reused for AUTH_CHECK_TTL_SECONDS, so a long-running
+        process (e.g. the browser daemon) doesn't recheck on every call.
+        Failures are not cached, so logging in from another process takes
+        effect right away.
+        """
+        now = time.time()
+        if self._authenticated_at and now - self._authenticated_at < AUTH_CHECK_TTL_SECONDS:
+            return True
+
+        if not self._check_state_file():
+            return False
+        self._authenticated_at = now
+        return True
+
+    def _check_state_file(self) -> bool:
+        """Check that saved browser state exists, warning if it is old"""
         if not self.state_file.exists():
             return False
 
@@ -97,16 +120,16 @@ class AuthManager:
         print("🔐 Starting authentication setup...")
         print(f"  Timeout: {timeout_minutes} minutes")
 
-        playwright = None
         context = None
 
         try:
-            playwright = sync_playwright().start()
+            playwright = get_playwright()
 
             # Launch using factory
             context = BrowserFactory.launch_persistent_context(
                 playwright,
-                headless=headless
+                headless=headless,
+                block_resources=False  # Login pages need their images/captchas
             )
 
             # Navigate to NotebookLM
@@ -114,7 +137,7 @@ class AuthManager:
             page.goto("https://notebooklm.google.com", wait_until="domcontentloaded")
 
             # Check if already authenticated
-            if "notebooklm.google.com" in page.url and "accounts.google.com" not in page.url:
+            if NOTEBOOKLM_URL_PATTERN.match(page.url):
                 print("  ✅ Already authenticated!")
                 self._save_browser_state(context)
                 return True
@@ -126,7 +149,7 @@ class AuthManager:
             try:
                 # Wait for URL to change to NotebookLM (regex ensures it's the actual domain, not a parameter)
                 timeout_ms = int(timeout_minutes * 60 * 1000)
-                page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=timeout_ms)
+                page.wait_for_url(NOTEBOOKLM_URL_PATTERN, timeout=timeout_ms)
 
                 print(f"  ✅ Login successful!")
 
@@ -151,18 +174,16 @@ class AuthManager:
                 except Exception:
                     pass
 
-            if playwright:
-                try:
-                    playwright.stop()
-                except Exception:
-                    pass
-
     def _save_browser_state(self, context: BrowserContext):
         """Save browser state to disk"""
+        self._authenticated_at = None
         try:
-            # Save storage state (cookies, localStorage)
-            context.storage_state(path=str(self.state_file))
-            print(f"  💾 Saved browser state to: {self.state_file}")
+            # Save storage state (cookies, localStorage), skipping the
+            # write when nothing changed
+            if save_state(context):
+                print(f"  💾 Saved browser state to: {self.state_file}")
+            else:
+                print(f"  💾 Browser state unchanged: {self.state_file}")
         except Exception as e:
             print(f"  ❌ Failed to save browser state: {e}")
             raise
@@ -187,6 +208,7 @@ class AuthManager:
             True if cleared successfully
         """
         print("🗑️ Clearing authentication data...")
+        self._authenticated_at = None
 
         try:
             # Remove browser state
@@ -243,11 +265,10 @@ class AuthManager:
 
         print("🔍 Validating authentication...")
 
-        playwright = None
         context = None
 
         try:
-            playwright = sync_playwright().start()
+            playwright = get_playwright()
 
             # Launch using factory
             context = BrowserFactory.launch_persistent_context(
@@ -260,7 +281,7 @@ class AuthManager:
             page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
 
             # Check if we can access NotebookLM
-            if "notebooklm.google.com" in page.url and "accounts.google.com" not in page.url:
+            if NOTEBOOKLM_URL_PATTERN.match(page.url):
                 print("  ✅ Authentication is valid")
                 return True
             else:
@@ -277,11 +298,17 @@ class AuthManager:
                     context.close()
                 except Exception:
                     pass
-            if playwright:
-                try:
-                    playwright.stop()
-                except Exception:
-                    pass
+
+
+_AUTH_MANAGER: Optional[AuthManager] = None
+
+
+def get_auth_manager() -> AuthManager:
+    """Get the AuthManager shared by every caller in this process"""
+    global _AUTH_MANAGER
+    if _AUTH_MANAGER is None:
+        _AUTH_MANAGER = AuthManager()
+    return _AUTH_MANAGER
 
 
 def main():
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Browser Daemon for NotebookLM
+Keeps one browser running between script invocations
+
+Launching Chrome dominates the cost of a single question, so with
+ask_question.py --keep-alive the questions are handed over a Unix socket to
+this long-lived process, which asks them on its shared session instead of
+starting a new browser every time. Each request still gets its own tab and
+a fresh chat. The daemon exits after DAEMON_IDLE_TIMEOUT_SECONDS without
+requests.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import (
+    DATA_DIR, DAEMON_SOCKET, DAEMON_LOG_FILE, DAEMON_LOCK_FILE, DAEMON_PROFILE_DIR,
+    DAEMON_IDLE_TIMEOUT_SECONDS, DEBUG
+)
+
+
+def is_supported() -> bool:
+    """Unix sockets are needed to talk to the daemon"""
+    return hasattr(socket, "AF_UNIX")
+
+
+def is_running() -> bool:
+    """
+    Check whether a daemon is listening
+
+    A successful connect() is enough: the daemon answers one request at a
+    time, so a ping can go unanswered while it is busy with an answer.
+    """
+    if not is_supported():
+        return False
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(2)
+            conn.connect(str(DAEMON_SOCKET))
+            return True
+    except OSError:
+        return False
+
+
+def request(payload: Dict[str, Any], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Send one request to the running daemon
+
+    Returns:
+        The daemon's reply, or None if no daemon is listening
+    """
+    if not is_supported():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(DAEMON_SOCKET))
+            conn.sendall(json.dumps(payload).encode() + b"\n")
+            conn.shutdown(socket.SHUT_WR)
+            return json.loads(_read_all(conn))
+    except (OSError, ValueError):
+        return None
+
+
+def _read_all(conn: socket.socket) -> bytes:
+    """Read until the other side closes its end"""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def _send(conn: socket.socket, reply: Dict[str, Any]):
+    """Send a reply, ignoring clients that went away (the browser stays up)"""
+    try:
+        conn.sendall(json.dumps(reply).encode())
+    except OSError:
+        pass
+
+
+def ensure_running(headless: bool = True, wait_seconds: int = 15) -> bool:
+    """
+    Start the daemon in the background unless one is already listening
+
+    Returns:
+        True once the daemon answers
+    """
+    if is_running():
+        return True
+    if not is_supported():
+        return False
+
+    # A second daemon started by a concurrent client exits on the lock
+    print("🚀 Starting browser daemon...")
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    args = [sys.executable, str(Path(__file__)), "serve"]
+    if not headless:
+        args.append("--show-browser")
+
+    with open(DAEMON_LOG_FILE, "ab") as log:
+        subprocess.Popen(
+            args, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+
+    deadline = time.time() + wait_seconds
+    while time.time() < deadline:
+        if is_running():
+            return True
+        time.sleep(0.2)
+
+    print(f"  ⚠️ Browser daemon did not start (see {DAEMON_LOG_FILE})")
+    return False
+
+
+def ask_via_daemon(
+    questions: List[str],
+    notebook_url: str,
+    headless: bool = True,
+    parallel: int = 1
+) -> Optional[List[Optional[str]]]:
+    """
+    Ask questions on the daemon's browser, starting the daemon if needed
+
+    Returns:
+        Answers in question order (None where one failed), or None if the
+        daemon couldn't be reached
+    """
+    if not ensure_running(headless):
+        return None
+
+    reply = request({
+        "cmd": "ask",
+        "questions": questions,
+        "notebook_url": notebook_url,
+        "headless": headless,
+        "parallel": parallel
+    })
+    if reply is None:
+        print("  ⚠️ Lost connection to the browser daemon")
+        return None
+    if "error" in reply:
+        # Report the daemon's error once rather than re-running the batch here
+        print(f"  ❌ Browser daemon error: {reply['error']}")
+        return [None] * len(questions)
+    return reply["answers"]
+
+
+def _handle(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one request on the shared session"""
+    # Imported here so clients don't pay for the browser modules
+    from ask_question import ask_questions, ask_questions_parallel
+
+    cmd = payload.get("cmd")
+    if cmd == "ping":
+        return {"ok": True, "pid": os.getpid()}
+
+    if cmd == "ask":
+        questions = payload["questions"]
+        kwargs = dict(headless=payload.get("headless", True), reuse_session=True)
+        if payload.get("parallel", 1) > 1 and len(questions) > 1:
+            answers = ask_questions_parallel(
+                questions, payload["notebook_url"], max_parallel=payload["parallel"], **kwargs
+            )
+        else:
+            answers = ask_questions(questions, payload["notebook_url"], **kwargs)
+        return {"answers": answers}
+
+    return {"error": f"Unknown command: {cmd}"}
+
+
+def serve(headless: bool = True, idle_timeout: int = DAEMON_IDLE_TIMEOUT_SECONDS):
+    """
+    Accept requests until stopped or idle for idle_timeout seconds
+
+    Requests are handled one at a time on this thread, since the sync
+    Playwright session can't be used from other threads. Only one daemon
+    runs at a time: it holds an flock() on DAEMON_LOCK_FILE until it exits.
+    """
+    import fcntl  # Unix only, like the socket
+    from browser_utils import get_session, close_session, set_session_profile
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    lock = open(DAEMON_LOCK_FILE, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        print("ℹ️ Browser daemon already running")
+        return
+
+    # Only remove a socket nobody answers on (left by a daemon that didn't
+    # exit cleanly)
+    if DAEMON_SOCKET.exists():
+        if is_running():
+            lock.close()
+            print(f"❌ Another process is listening on {DAEMON_SOCKET}")
+            return
+        DAEMON_SOCKET.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(DAEMON_SOCKET))
+    os.chmod(DAEMON_SOCKET, 0o600)
+    server.listen()
+    server.settimeout(idle_timeout)
+
+    print(f"🟢 Browser daemon listening on {DAEMON_SOCKET} (pid {os.getpid()})")
+
+    try:
+        # Launch up front so the first request doesn't wait for it. The
+        # daemon has its own profile (seeded from state.json), so plain
+        # ask_question.py and auth_manager.py runs can still open the main one
+        set_session_profile(str(DAEMON_PROFILE_DIR))
+        get_session(headless)
+
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                print(f"💤 Idle for {idle_timeout}s, shutting down")
+                break
+
+            with conn:
+                conn.settimeout(None)
+                try:
+                    raw = _read_all(conn)
+                    if not raw:
+                        continue  # is_running() probe
+                    payload = json.loads(raw)
+                except (OSError, ValueError) as e:
+                    _send(conn, {"error": f"Bad request: {e}"})
+                    continue
+
+                if payload.get("cmd") == "stop":
+                    _send(conn, {"ok": True})
+                    print("🛑 Stop requested")
+                    break
+
+                try:
+                    reply = _handle(payload)
+                except Exception as e:
+                    reply = {"error": str(e)}
+                    if DEBUG:
+                        traceback.print_exc()
+
+                _send(conn, reply)
+
+            sys.stdout.flush()
+
+    finally:
+        server.close()
+        if DAEMON_SOCKET.exists():
+            DAEMON_SOCKET.unlink()
+        close_session()
+        lock.close()  # Releases the flock
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep a NotebookLM browser running between calls')
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    start_parser = subparsers.add_parser('start', help='Start the daemon in the background')
+    start_parser.add_argument('--show-browser', action='store_true', help='Show browser')
+
+    serve_parser = subparsers.add_parser('serve', help='Run the daemon in the foreground')
+    serve_parser.add_argument('--show-browser', action='store_true', help='Show browser')
+    serve_parser.add_argument('--idle-timeout', type=int, default=DAEMON_IDLE_TIMEOUT_SECONDS,
+                              help=f'Exit after this many idle seconds (default: {DAEMON_IDLE_TIMEOUT_SECONDS})')
+
+    subparsers.add_parser('status', help='Check whether the daemon is running')
+    subparsers.add_parser('stop', help='Stop the daemon')
+
+    args = parser.parse_args()
+
+    if not is_supported():
+        print("❌ The browser daemon needs Unix domain sockets (not available on this platform)")
+        return 1
+
+    if args.command == 'start':
+        if ensure_running(headless=not args.show_browser):
+            print("✅ Browser daemon running")
+            return 0
+        return 1
+
+    elif args.command == 'serve':
+        serve(headless=not args.show_browser, idle_timeout=args.idle_timeout)
+        return 0
+
+    elif args.command == 'status':
+        if not is_running():
+            print("⚪ Browser daemon not running")
+            return 1
+        reply = request({"cmd": "ping"}, timeout=2)
+        if reply:
+            print(f"🟢 Browser daemon running (pid {reply.get('pid')})")
+        else:
+            print("🟢 Browser daemon running (busy with a request)")
+        return 0
+
+    elif args.command == 'stop':
+        if not is_running():
+            print("⚪ Browser daemon not running")
+        elif request({"cmd": "stop"}, timeout=10):
+            print("✅ Browser daemon stopped")
+        else:
+            print("⏳ Browser daemon busy; it stops after the current request")
+        return 0
+
+    else:
+        parser.print_help()
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,7 +15,11 @@ from patchright.sync_api import BrowserContext, Page
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from browser_utils import StealthUtils
+from browser_utils import first_visible, last_text, wait_for_stable_text
+from config import (
+    QUERY_INPUT_SELECTORS, RESPONSE_SELECTORS, THINKING_SELECTOR,
+    GOOGLE_LOGIN_URL_PATTERN, PAGE_LOAD_TIMEOUT, ANSWER_QUIET_MS
+)
 
 
 class BrowserSession:
@@ -43,7 +47,6 @@ class BrowserSession:
         self.notebook_url = notebook_url
         self.context = context
         self.page = None
-        self.stealth = StealthUtils()
 
         # Initialize the session
         self._initialize()
@@ -57,20 +60,16 @@ class BrowserSession:
         print(f"  🌐 Navigating to NotebookLM...")
 
         try:
-            # Navigate to notebook
-            self.page.goto(self.notebook_url, wait_until="domcontentloaded", timeout=30000)
+            # Navigate to notebook; return on commit, _wait_for_ready gates readiness
+            self.page.goto(self.notebook_url, wait_until="commit", timeout=PAGE_LOAD_TIMEOUT)
 
             # Check if login is needed
-            if "accounts.google.com" in self.page.url:
+            if GOOGLE_LOGIN_URL_PATTERN.match(self.page.url):
                 raise RuntimeError("Authentication required. Please run auth_manager.py setup first.")
 
             # Wait for page to be ready
             self._wait_for_ready()
 
-            # Simulate human inspection
-            self.stealth.random_mouse_movement(self.page)
-            self.stealth.random_delay(300, 600)
-
             print(f"✅ Session {self.id} ready!")
 
         except Exception as e:
@@ -81,12 +80,9 @@ class BrowserSession:
 
     def _wait_for_ready(self):
         """Wait for NotebookLM page to be ready"""
-        try:
-            # Wait for chat input
-            self.page.wait_for_selector("textarea.query-box-input", timeout=10000, state="visible")
-        except Exception:
-            # Try alternative selector
-            self.page.wait_for_selector('textarea[aria-label="Feld für Anfragen"]', timeout=5000, state="visible")
+        # Wait for chat input (any known selector)
+        if not first_visible(self.page, QUERY_INPUT_SELECTORS, timeout=PAGE_LOAD_TIMEOUT):
+            raise TimeoutError("NotebookLM query input did not appear")
 
     def ask(self, question: str) -> Dict[str, Any]:
         """
@@ -107,27 +103,19 @@ class BrowserSession:
             # Snapshot current answer to detect new response
             previous_answer = self._snapshot_latest_response()
 
-            # Find chat input
-            chat_input_selector = "textarea.query-box-input"
-            try:
-                self.page.wait_for_selector(chat_input_selector, timeout=5000, state="visible")
-            except Exception:
-                chat_input_selector = 'textarea[aria-label="Feld für Anfragen"]'
-                self.page.wait_for_selector(chat_input_selector, timeout=5000, state="visible")
-
-            # Click and type with human-like behavior
-            self.stealth.realistic_click(self.page, chat_input_selector)
-            self.stealth.human_type(self.page, chat_input_selector, question)
+            # Find chat input (all selectors raced in one wait)
+            chat_input = first_visible(self.page, QUERY_INPUT_SELECTORS, timeout=5000)
+            if not chat_input:
+                raise TimeoutError("NotebookLM query input did not appear")
 
-            # Small pause before submit
-            self.stealth.random_delay(300, 800)
+            # Enter the question in one step; per-character typing only added latency
+            chat_input.fill(question)
 
-            # Submit
-            self.page.keyboard.press("Enter")
+            # Submit on the input itself, not whatever element has focus
+            chat_input.press("Enter")
 
-            # Wait for response
+            # Wait for response (ignores the previous answer, so no settle delay)
             print("  ⏳ Waiting for response...")
-            self.stealth.random_delay(1500, 3000)
 
             # Get new answer
             answer = self._wait_for_latest_answer(previous_answer)
@@ -156,53 +144,22 @@ class BrowserSession:
 
     def _snapshot_latest_response(self) -> Optional[str]:
         """Get the current latest response text"""
-        try:
-            # Use correct NotebookLM selector
-            responses = self.page.query_selector_all(".to-user-container .message-text-content")
-            if responses:
-                return responses[-1].inner_text()
-        except Exception:
-            pass
-        return None
+        return last_text(self.page, RESPONSE_SELECTORS)
 
     def _wait_for_latest_answer(self, previous_answer: Optional[str], timeout: int = 120) -> str:
         """Wait for and extract the new answer"""
-        start_time = time.time()
-        last_candidate = None
-        stable_count = 0
-
-        while time.time() - start_time < timeout:
-            # Check if NotebookLM is still thinking (most reliable indicator)
-            try:
-                thinking_element = self.page.query_selector('div.thinking-message')
-                if thinking_element and thinking_element.is_visible():
-                    time.sleep(0.5)
-                    continue
-            except Exception:
-                pass
-
-            try:
-                # Use correct NotebookLM selector
-                responses = self.page.query_selector_all(".to-user-container .message-text-content")
-
-                if responses:
-                    latest_text = responses[-1].inner_text().strip()
-
-                    # Check if it's a new response
-                    if latest_text and latest_text != previous_answer:
-                        # Check if text is stable (3 consecutive polls)
-                        if latest_text == last_candidate:
-                            stable_count += 1
-                            if stable_count >= 3:
-                                return latest_text
-                        else:
-                            stable_count = 1
-                            last_candidate = latest_text
-
-            except Exception:
-                pass
-
-            time.sleep(0.5)
+        # One debounced wait in the browser: a new answer that stays
+        # unchanged (and not thinking) for ANSWER_QUIET_MS
+        answer = wait_for_stable_text(
+            self.page,
+            RESPONSE_SELECTORS,
+            previous_answer,
+            timeout=timeout * 1000,
+            busy_selector=THINKING_SELECTOR,
+            quiet_ms=ANSWER_QUIET_MS
+        )
+        if answer:
+            return answer
 
         raise TimeoutError(f"No response received within {timeout} seconds")
 
@@ -210,7 +167,7 @@ class BrowserSession:
         """Reset the chat by reloading the page"""
         print(f"🔄 Resetting session {self.id}...")
 
-        self.page.reload(wait_until="domcontentloaded")
+        self.page.reload(wait_until="commit", timeout=PAGE_LOAD_TIMEOUT)
         self._wait_for_ready()
 
         previous_count = self.message_count
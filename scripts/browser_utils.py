@@ -3,13 +3,18 @@ Browser Utilities for NotebookLM Skill
 Handles browser launching, stealth features, and common interactions
 """
 
+import os
 import json
-import time
-import random
-from typing import Optional, List
+import hashlib
+import atexit
+import threading
+from typing import Any, Optional, List, Dict
 
-from patchright.sync_api import Playwright, BrowserContext, Page
-from config import BROWSER_PROFILE_DIR, STATE_FILE, BROWSER_ARGS, USER_AGENT
+from patchright.sync_api import sync_playwright, Playwright, BrowserContext, Page, Locator
+from config import (
+    BROWSER_PROFILE_DIR, STATE_FILE, BROWSER_ARGS, BROWSER_CHANNEL, USER_AGENT,
+    BLOCKED_URL_PATTERNS
+)
 
 
 class BrowserFactory:
@@ -19,16 +24,21 @@ class BrowserFactory:
     def launch_persistent_context(
         playwright: Playwright,
         headless: bool = True,
-        user_data_dir: str = str(BROWSER_PROFILE_DIR)
+        user_data_dir: str = str(BROWSER_PROFILE_DIR),
+        block_resources: bool = True
     ) -> BrowserContext:
         """
         Launch a persistent browser context with anti-detection features
         and cookie workaround.
+
+        Args:
+            block_resources: Block analytics and images/fonts/media
+                (leave off for interactive login)
         """
         # Launch persistent context
         context = playwright.chromium.launch_persistent_context(
             user_data_dir=user_data_dir,
-            channel="chrome",  # Use real Chrome
+            channel=BROWSER_CHANNEL,
             headless=headless,
             no_viewport=True,
             ignore_default_args=["--enable-automation"],
@@ -36,72 +46,374 @@ class BrowserFactory:
             args=BROWSER_ARGS
         )
 
+        if block_resources:
+            for page in context.pages:
+                BrowserFactory._block_urls(page)
+            context.on("page", BrowserFactory._block_urls)
+
         # Cookie Workaround for Playwright bug #36139
         # Session cookies (expires=-1) don't persist in user_data_dir automatically
         BrowserFactory._inject_cookies(context)
 
         return context
 
+    @staticmethod
+    def _block_urls(page: Page):
+        """Block BLOCKED_URL_PATTERNS on a tab through CDP"""
+        try:
+            session = page.context.new_cdp_session(page)
+            session.send("Network.enable")
+            session.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception:
+            pass  # Blocking only saves bandwidth; the tab works without it
+
     @staticmethod
     def _inject_cookies(context: BrowserContext):
         """Inject cookies from state.json if available"""
-        if STATE_FILE.exists():
-            try:
-                with open(STATE_FILE, 'r') as f:
-                    state = json.load(f)
-                    if 'cookies' in state and len(state['cookies']) > 0:
-                        context.add_cookies(state['cookies'])
-                        # print(f"  🔧 Injected {len(state['cookies'])} cookies from state.json")
-            except Exception as e:
-                print(f"  ⚠️  Could not load state.json: {e}")
+        try:
+            cookies = _load_state_cookies()
+            if cookies:
+                context.add_cookies(cookies)
+                # print(f"  🔧 Injected {len(cookies)} cookies from state.json")
+        except Exception as e:
+            print(f"  ⚠️  Could not load state.json: {e}")
 
 
-class StealthUtils:
-    """Human-like interaction utilities"""
+# Parsed state.json cookies and content hash, re-read only when the
+# file's mtime changes
+_COOKIE_CACHE: Dict[str, Any] = {"mtime": None, "cookies": [], "hash": None}
 
-    @staticmethod
-    def random_delay(min_ms: int = 100, max_ms: int = 500):
-        """Add random delay"""
-        time.sleep(random.uniform(min_ms / 1000, max_ms / 1000))
 
-    @staticmethod
-    def human_type(page: Page, selector: str, text: str, wpm_min: int = 320, wpm_max: int = 480):
-        """Type with human-like speed"""
-        element = page.query_selector(selector)
-        if not element:
-            # Try waiting if not immediately found
+def _state_hash(raw: bytes) -> str:
+    """Short content hash of serialized state"""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _remember_state(raw: bytes, state: Dict[str, Any]):
+    """Cache state.json as just read or written"""
+    _COOKIE_CACHE["cookies"] = state.get("cookies", [])
+    _COOKIE_CACHE["hash"] = _state_hash(raw)
+    _COOKIE_CACHE["mtime"] = STATE_FILE.stat().st_mtime_ns
+
+
+def _load_state_cookies() -> List[Dict[str, Any]]:
+    """Get the cookies saved in state.json (empty if there is no file)"""
+    try:
+        mtime = STATE_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+
+    if mtime != _COOKIE_CACHE["mtime"]:
+        raw = STATE_FILE.read_bytes()
+        _remember_state(raw, json.loads(raw))
+
+    return _COOKIE_CACHE["cookies"]
+
+
+def save_state(context: BrowserContext) -> bool:
+    """
+    Save the context's storage state (cookies, localStorage) to state.json
+
+    The file is only rewritten when its content changed; otherwise just its
+    mtime is refreshed, since that dates the last successful login.
+
+    Returns:
+        True if the file was rewritten
+    """
+    state = context.storage_state()
+    raw = json.dumps(state, indent=2).encode()
+
+    try:
+        _load_state_cookies()
+        unchanged = _COOKIE_CACHE["hash"] == _state_hash(raw)
+    except (OSError, ValueError):
+        unchanged = False  # Unreadable or corrupt old file: overwrite it
+
+    if unchanged and STATE_FILE.exists():
+        os.utime(STATE_FILE)
+        _COOKIE_CACHE["mtime"] = STATE_FILE.stat().st_mtime_ns
+        return False
+
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    STATE_FILE.write_bytes(raw)
+    _remember_state(raw, state)
+    return True
+
+
+class _ThreadPlaywright(threading.local):
+    """Per-thread slot for the Playwright driver"""
+    playwright: Optional[Playwright] = None
+
+
+_PLAYWRIGHT = _ThreadPlaywright()
+
+
+def get_playwright() -> Playwright:
+    """
+    Get this thread's Playwright driver, starting it on first use.
+
+    Starting the driver spawns a Node process, so it is kept for the life
+    of the thread rather than restarted for every browser launch. The sync
+    API can't be shared across threads, hence one driver per thread.
+    """
+    if _PLAYWRIGHT.playwright is None:
+        _PLAYWRIGHT.playwright = sync_playwright().start()
+    return _PLAYWRIGHT.playwright
+
+
+def stop_playwright():
+    """Stop this thread's Playwright driver if one is running"""
+    playwright, _PLAYWRIGHT.playwright = _PLAYWRIGHT.playwright, None
+    if playwright:
+        try:
+            playwright.stop()
+        except Exception:
+            pass
+
+
+class SharedBrowser:
+    """Persistent context shared across calls in one process"""
+
+    def __init__(self, playwright: Playwright, context: BrowserContext, headless: bool):
+        self.playwright = playwright
+        self.context = context
+        self.headless = headless
+        self.state_mtime = _state_mtime()  # state.json as injected at launch
+        self.closed = False
+        context.on("close", self._on_close)
+
+    def _on_close(self, _context: BrowserContext):
+        """Remember that the context went away"""
+        self.closed = True
+
+    def is_alive(self) -> bool:
+        """
+        Check the context is still running (Chrome may have crashed, or the
+        user closed a --show-browser window)
+
+        The sync API only delivers the "close" event during a call, so a
+        cheap round-trip is made to surface it.
+        """
+        if not self.closed:
             try:
-                element = page.wait_for_selector(selector, timeout=2000)
-            except:
-                pass
-        
-        if not element:
-            print(f"⚠️ Element not found for typing: {selector}")
-            return
-
-        # Click to focus
-        element.click()
-        
-        # Type
-        for char in text:
-            element.type(char, delay=random.uniform(25, 75))
-            if random.random() < 0.05:
-                time.sleep(random.uniform(0.15, 0.4))
+                self.context.cookies()
+            except Exception:
+                self.closed = True
+        return not self.closed
+
+    def refresh_cookies(self):
+        """Re-inject the cookies from state.json if it changed since launch"""
+        mtime = _state_mtime()
+        if mtime != self.state_mtime:
+            self.state_mtime = mtime
+            BrowserFactory._inject_cookies(self.context)
+
+    def close(self):
+        """Close the context (the Playwright driver keeps running)"""
+        try:
+            self.context.close()
+        except Exception:
+            pass
+
+
+_SESSION: Optional[SharedBrowser] = None
+_SESSION_PROFILE_DIR = str(BROWSER_PROFILE_DIR)
+
+
+def _state_mtime() -> Optional[int]:
+    """state.json's mtime, or None if there is no file"""
+    try:
+        return STATE_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def set_session_profile(user_data_dir: str):
+    """
+    Launch the process-wide session on another profile (e.g. the browser
+    daemon's own), closing a session already running on a different one
+    """
+    global _SESSION_PROFILE_DIR
+    if user_data_dir != _SESSION_PROFILE_DIR:
+        close_session()
+        _SESSION_PROFILE_DIR = user_data_dir
+
+
+def get_session(headless: bool = True) -> SharedBrowser:
+    """
+    Get the process-wide browser session, launching it on first use.
+
+    Chromium startup dominates the cost of a single query, so callers that
+    run several operations in one process should reuse this session and
+    only open/close pages on it.
+    """
+    global _SESSION
+
+    # A persistent profile can only be opened once, so switching
+    # headless mode means relaunching; a dead context is relaunched too
+    if _SESSION and (_SESSION.headless != headless or not _SESSION.is_alive()):
+        close_session()
+
+    if _SESSION is None:
+        playwright = get_playwright()
+        context = BrowserFactory.launch_persistent_context(
+            playwright,
+            headless=headless,
+            user_data_dir=_SESSION_PROFILE_DIR
+        )
+        _SESSION = SharedBrowser(playwright, context, headless)
+    else:
+        # Pick up a login saved since launch (e.g. by auth_manager.py setup)
+        _SESSION.refresh_cookies()
+
+    return _SESSION
+
+
+def close_session():
+    """Shut down the process-wide browser session if one is running"""
+    global _SESSION
+    if _SESSION:
+        session, _SESSION = _SESSION, None
+        session.close()
+
+
+def _shutdown():
+    """Close the shared session, then stop the main thread's driver"""
+    close_session()
+    stop_playwright()
+
+
+atexit.register(_shutdown)
+
+
+def first_visible(page: Page, selectors: List[str], timeout: int) -> Optional[Locator]:
+    """
+    Wait for whichever of the selectors becomes visible first
+
+    The selectors are chained with Locator.or_() and raced in a single
+    wait, so a missing primary selector doesn't cost a full timeout before
+    the fallbacks are tried.
+
+    Returns:
+        Locator for the first visible match, or None on timeout
+    """
+    locator = page.locator(selectors[0])
+    for selector in selectors[1:]:
+        locator = locator.or_(page.locator(selector))
+
+    try:
+        locator.first.wait_for(state="visible", timeout=timeout)
+        return locator.first
+    except Exception:
+        return None
+
+
+_LAST_TEXT_JS = """
+(selectors) => {
+    for (const selector of selectors) {
+        const elements = document.querySelectorAll(selector);
+        if (elements.length) {
+            const text = elements[elements.length - 1].innerText.trim();
+            if (text) return text;
+        }
+    }
+    return null;
+}
+"""
+
+
+def last_text(page: Page, selectors: List[str]) -> Optional[str]:
+    """
+    Get the text of the last element matching the first selector that has any
+
+    Resolved with one page.evaluate instead of a query_selector_all plus an
+    inner_text round-trip per selector.
+
+    Returns:
+        Stripped text, or None if nothing matched
+    """
+    try:
+        return page.evaluate(_LAST_TEXT_JS, selectors)
+    except Exception:
+        return None
+
+
+_STABLE_TEXT_JS = """
+([selectors, previous, busySelector, quietMs]) => {
+    const state = window.__nblmStableText || (window.__nblmStableText = {});
+    const busy = busySelector && document.querySelector(busySelector);
+    const text = busy && busy.checkVisibility() ? null : (""" + _LAST_TEXT_JS.strip() + """)(selectors);
+    if (!text || text === previous) {
+        state.text = null;
+        return false;
+    }
+    if (text !== state.text) {
+        state.text = text;
+        state.since = Date.now();
+        return false;
+    }
+    return Date.now() - state.since >= quietMs ? text : false;
+}
+"""
+
+
+def wait_for_stable_text(
+    page: Page,
+    selectors: List[str],
+    previous: Optional[str],
+    timeout: int,
+    busy_selector: Optional[str] = None,
+    quiet_ms: int = 1500
+) -> Optional[str]:
+    """
+    Wait for a new last-element text that stops changing
+
+    Debounced in the browser with one wait_for_function, instead of
+    re-reading the text from Python until it repeats.
+
+    Args:
+        selectors: Selectors to read the text from, as in last_text
+        previous: Text to ignore (the answer that was there before)
+        timeout: Maximum wait in milliseconds
+        busy_selector: While this element is visible the text doesn't count
+        quiet_ms: How long the text must stay unchanged
+
+    Returns:
+        The stable text, or None on timeout
+    """
+    try:
+        handle = page.wait_for_function(
+            _STABLE_TEXT_JS,
+            arg=[selectors, previous, busy_selector, quiet_ms],
+            polling=250,
+            timeout=timeout
+        )
+        return handle.json_value()
+    except Exception:
+        return None
+
+
+class StealthUtils:
+    """Input helpers for the query box"""
 
     @staticmethod
-    def realistic_click(page: Page, selector: str):
-        """Click with realistic movement"""
-        element = page.query_selector(selector)
-        if not element:
-            return
-
-        # Optional: Move mouse to element (simplified)
-        box = element.bounding_box()
-        if box:
-            x = box['x'] + box['width'] / 2
-            y = box['y'] + box['height'] / 2
-            page.mouse.move(x, y, steps=5)
-
-        StealthUtils.random_delay(100, 300)
-        element.click()
-        StealthUtils.random_delay(100, 300)
+    def set_value(element: Locator, text: str):
+        """
+        Set a textarea's value in one call and fire its input event,
+        falling back to fill()
+
+        Uses the native value setter, so frameworks that track the value
+        (NotebookLM's Angular forms) still see the change.
+        """
+        try:
+            element.evaluate(
+                """(el, value) => {
+                    const setter = Object.getOwnPropertyDescriptor(
+                        HTMLTextAreaElement.prototype, "value").set;
+                    setter.call(el, value);
+                    el.dispatchEvent(new Event("input", { bubbles: true }));
+                }""",
+                text
+            )
+        except Exception:
+            element.fill(text)
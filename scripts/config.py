@@ -3,6 +3,8 @@ Configuration for NotebookLM Skill
 Centralizes constants, selectors, and paths
 """
 
+import os
+import re
 from pathlib import Path
 
 # Paths
@@ -11,8 +13,18 @@ DATA_DIR = SKILL_DIR / "data"
 BROWSER_STATE_DIR = DATA_DIR / "browser_state"
 BROWSER_PROFILE_DIR = BROWSER_STATE_DIR / "browser_profile"
 STATE_FILE = BROWSER_STATE_DIR / "state.json"
+POOL_PROFILES_DIR = BROWSER_STATE_DIR / "pool_profiles"  # One profile per context_pool worker
+DAEMON_PROFILE_DIR = BROWSER_STATE_DIR / "daemon_profile"  # browser_daemon.py's own, so it never locks the main one
 AUTH_INFO_FILE = DATA_DIR / "auth_info.json"
 LIBRARY_FILE = DATA_DIR / "library.json"
+DEBUG_DIR = DATA_DIR / "debug"
+DAEMON_SOCKET = DATA_DIR / "browser_daemon.sock"
+DAEMON_LOG_FILE = DATA_DIR / "browser_daemon.log"
+DAEMON_LOCK_FILE = DATA_DIR / "browser_daemon.lock"  # flock()ed by the running daemon
+
+# NotebookLM URLs
+NOTEBOOKLM_URL_PATTERN = re.compile(r"^https://notebooklm\.google\.com/")
+GOOGLE_LOGIN_URL_PATTERN = re.compile(r"^https://accounts\.google\.com/")
 
 # NotebookLM Selectors
 QUERY_INPUT_SELECTORS = [
@@ -20,6 +32,9 @@ QUERY_INPUT_SELECTORS = [
     'textarea[aria-label="Feld für Anfragen"]',  # Fallback German
     'textarea[aria-label="Input for queries"]',  # Fallback English
 ]
+QUERY_INPUT_SELECTOR = ", ".join(QUERY_INPUT_SELECTORS)  # Any of them, as one selector
+
+THINKING_SELECTOR = "div.thinking-message"  # Visible while an answer is generated
 
 RESPONSE_SELECTORS = [
     ".to-user-container .message-text-content",  # Primary
@@ -33,12 +48,55 @@ BROWSER_ARGS = [
     '--disable-dev-shm-usage',
     '--no-sandbox',
     '--no-first-run',
-    '--no-default-browser-check'
+    '--no-default-browser-check',
+    # Keep headless/background tabs at full speed while waiting on answers
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    # Skip startup and idle background work the skill never uses. No
+    # --disable-features here: it would replace Patchright's own list
+    # (Translate, AcceptCHFrame, ...), which already comes first, along
+    # with --disable-background-networking
+    '--disable-extensions',
+    '--disable-sync'
+]
+
+# Browser channel: real Chrome by default; set NBLM_CHROME_CHANNEL= (empty)
+# to use Patchright's bundled Chromium instead
+BROWSER_CHANNEL = os.environ.get("NBLM_CHROME_CHANNEL", "chrome") or None
+
+# Requests blocked by BrowserFactory (the skill only reads NotebookLM text),
+# as CDP Network.setBlockedURLs wildcards. Unlike context.route(), CDP
+# blocking leaves the HTTP cache on.
+BLOCKED_URL_PATTERNS = [
+    # Analytics, plus web-font CSS (useless with fonts blocked)
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+    "*fonts.googleapis.com/*",
+] + [
+    # Images, fonts and media, with or without a query string
+    f"*.{ext}{query}"
+    for ext in ("png", "jpg", "jpeg", "gif", "webp", "svg", "ico",
+                "woff", "woff2", "ttf", "otf", "mp3", "mp4", "webm")
+    for query in ("", "?*")
 ]
 
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
+# Questions at least this long are set as the input's value in one call instead of fill()
+SET_VALUE_MIN_CHARS = 5000
+
+# Largest --questions-file accepted (read whole into memory)
+MAX_QUESTIONS_FILE_BYTES = 1024 * 1024
+
 # Timeouts
 LOGIN_TIMEOUT_MINUTES = 10
 QUERY_TIMEOUT_SECONDS = 120
 PAGE_LOAD_TIMEOUT = 30000
+ANSWER_QUIET_MS = 1500  # An answer counts as done once unchanged this long
+DAEMON_IDLE_TIMEOUT_SECONDS = 900  # browser_daemon.py exits after this long without requests
+AUTH_CHECK_TTL_SECONDS = 60  # How long an is_authenticated() result is reused
+
+# Debugging (set NBLM_DEBUG=1 for tracebacks on errors)
+DEBUG = os.environ.get("NBLM_DEBUG", "0") == "1"
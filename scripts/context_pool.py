@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Browser Context Pool for NotebookLM
+Asks questions across several notebooks at once, one browser per worker thread
+
+A persistent profile can only be opened by one browser at a time, so each
+worker gets its own profile directory (seeded with the cookies from
+state.json) and its own Playwright driver, since the sync API is bound to
+the thread that started it.
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from patchright.sync_api import Page
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import POOL_PROFILES_DIR, DEBUG
+from auth_manager import get_auth_manager
+from browser_utils import BrowserFactory, get_playwright, stop_playwright
+from ask_question import get_library, open_notebook, ask_on_page, print_answers
+
+
+class ContextPool:
+    """Fixed number of browser workers pulling (notebook, question) jobs"""
+
+    def __init__(self, size: int = 3, headless: bool = True):
+        self.size = max(1, size)
+        self.headless = headless
+
+    @staticmethod
+    def profile_dir(slot: int) -> Path:
+        """Profile directory for one worker"""
+        return POOL_PROFILES_DIR / f"slot_{slot}"
+
+    def ask_batch(self, jobs: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Ask every job's question on its notebook
+
+        Each worker keeps one tab per notebook, so jobs on the same notebook
+        that land on the same worker share its chat.
+
+        Args:
+            jobs: (notebook_url, question) pairs
+
+        Returns:
+            Answers in job order (None where a question failed)
+        """
+        pending: "queue.Queue[Tuple[int, str, str]]" = queue.Queue()
+        for index, (notebook_url, question) in enumerate(jobs):
+            pending.put((index, notebook_url, question))
+
+        results: List[Optional[str]] = [None] * len(jobs)
+        workers = [
+            threading.Thread(target=self._worker, args=(slot, pending, results), daemon=True)
+            for slot in range(min(self.size, len(jobs)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return results
+
+    def _worker(self, slot: int, pending: "queue.Queue", results: List[Optional[str]]):
+        """Launch this slot's browser and work through the queue"""
+        context = None
+        pages: Dict[str, Page] = {}
+
+        try:
+            context = BrowserFactory.launch_persistent_context(
+                get_playwright(),
+                headless=self.headless,
+                user_data_dir=str(self.profile_dir(slot))
+            )
+
+            while True:
+                try:
+                    index, notebook_url, question = pending.get_nowait()
+                except queue.Empty:
+                    break
+
+                try:
+                    page = pages.get(notebook_url)
+                    if page is None:
+                        page = context.new_page()
+                        if not open_notebook(page, notebook_url):
+                            page.close()
+                            continue
+                        pages[notebook_url] = page
+
+                    results[index] = ask_on_page(page, question)
+                except Exception as e:
+                    print(f"  ❌ Error (worker {slot}): {e}")
+                    if DEBUG:
+                        traceback.print_exc()
+
+        except Exception as e:
+            # Jobs left in the queue are picked up by the other workers
+            print(f"  ❌ Worker {slot} could not start: {e}")
+
+        finally:
+            if context:
+                try:
+                    context.close()
+                except Exception:
+                    pass
+            stop_playwright()
+
+
+def ask_across_notebooks(
+    jobs: List[Tuple[str, str]],
+    size: int = 3,
+    headless: bool = True
+) -> List[Optional[str]]:
+    """
+    Ask questions on several notebooks concurrently
+
+    Args:
+        jobs: (notebook_url, question) pairs
+        size: Number of browsers to run at once
+        headless: Run browsers in headless mode
+
+    Returns:
+        Answers in job order (None where a question failed)
+    """
+    if not get_auth_manager().is_authenticated():
+        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+        return [None] * len(jobs)
+
+    print(f"🧵 Asking {len(jobs)} questions with up to {size} browsers...")
+    return ContextPool(size, headless).ask_batch(jobs)
+
+
+def _resolve_notebook(notebook: str) -> Optional[str]:
+    """Map a library notebook ID to its URL (URLs pass through)"""
+    if notebook.startswith("https://"):
+        return notebook
+    entry = get_library().get_notebook(notebook)
+    return entry['url'] if entry else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ask NotebookLM questions across notebooks concurrently')
+
+    parser.add_argument('--job', nargs=2, action='append', required=True,
+                        metavar=('NOTEBOOK', 'QUESTION'),
+                        help='Notebook ID or URL and a question for it (repeat for more)')
+    parser.add_argument('--size', type=int, default=3,
+                        help='Number of browsers to run at once (default: 3)')
+    parser.add_argument('--show-browser', action='store_true', help='Show browsers')
+
+    args = parser.parse_args()
+
+    jobs = []
+    for notebook, question in args.job:
+        notebook_url = _resolve_notebook(notebook)
+        if not notebook_url:
+            print(f"❌ Notebook '{notebook}' not found")
+            return 1
+        jobs.append((notebook_url, question))
+
+    answers = ask_across_notebooks(jobs, size=args.size, headless=not args.show_browser)
+    return print_answers([question for _, question in jobs], answers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
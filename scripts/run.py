@@ -51,6 +51,8 @@ def main():
         print("Usage: python run.py <script_name> [args...]")
         print("\nAvailable scripts:")
         print("  ask_question.py    - Query NotebookLM")
+        print("  context_pool.py     - Query several notebooks at once")
+        print("  browser_daemon.py   - Keep a browser running between calls")
         print("  notebook_manager.py - Manage notebook library")
         print("  session_manager.py  - Manage sessions")
         print("  auth_manager.py     - Handle authentication")